@@ -1,8 +1,9 @@
 #!/bin/bash
 BASE_TEMP_DIR="/tmp"
+DEBUGGING_PORT="${1:-9222}"
 TEMP_DIR=$(mktemp -d "$BASE_TEMP_DIR/chromium.XXXXXXXX")
 
-echo "Running chromium with temporary profile in: $TEMP_DIR"
+echo "Running chromium on debugging port $DEBUGGING_PORT with temporary profile in: $TEMP_DIR"
 
 unameOut="$(uname -s)"
 case "${unameOut}" in
@@ -14,7 +15,7 @@ echo ${machine}
 
 # https://peter.sh/experiments/chromium-command-line-switches/
 "${chromiumPath}" \
-    --remote-debugging-port=9222 --enable-automation \
+    --remote-debugging-port="$DEBUGGING_PORT" --enable-automation \
     --user-data-dir="$TEMP_DIR" --no-first-run \
     --disk-cache-size=0  \
     --window-size=1400,950 --window-position=0,0 \
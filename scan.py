@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 
 import argparse
-import base64
 import json
 import multiprocessing as mp
 import os
 import subprocess
+import sys
+import threading
 import traceback
-from functools import partial
+from collections import defaultdict
+from functools import lru_cache
 from multiprocessing import Lock
 from urllib.parse import urlparse
 
@@ -19,6 +21,24 @@ from langdetect import detect
 from tld import get_fld, get_tld
 from tranco import Tranco
 
+# use the SIMD accelerated base64 decoding if it is installed
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
+# use orjson for writing the results if it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# use fastText for the language detection if it is installed
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
 
 # Possible improvements:
 # - if cookie notice is displayed in iframe (e.g. forbes.com), currently the 
@@ -30,6 +50,210 @@ FAILED_REASON_TIMEOUT = 'Page.navigate timeout'
 FAILED_REASON_STATUS_CODE = 'status code'
 FAILED_REASON_LOADING = 'loading failed'
 
+# loading errors that only depend on the host, i.e. loading the page with
+# another protocol fails as well
+HOST_LOADING_ERRORS = ['net::ERR_NAME_NOT_RESOLVED', 'net::ERR_NAME_RESOLUTION_FAILED']
+
+DEBUGGER_BASE_PORT = 9222
+
+FASTTEXT_MODEL_FILENAME = os.environ.get('FASTTEXT_LID', 'resources/lid.176.ftz')
+
+# the language codes that langdetect can return; fastText labels outside of
+# them (e.g. `zh`, which langdetect splits into `zh-cn` and `zh-tw`) are
+# detected with langdetect, so that the results use the same codes
+LANGDETECT_LANGUAGES = frozenset([
+    'af', 'ar', 'bg', 'bn', 'ca', 'cs', 'cy', 'da', 'de', 'el', 'en', 'es',
+    'et', 'fa', 'fi', 'fr', 'gu', 'he', 'hi', 'hr', 'hu', 'id', 'it', 'ja',
+    'kn', 'ko', 'lt', 'lv', 'mk', 'ml', 'mr', 'ne', 'nl', 'no', 'pa', 'pl',
+    'pt', 'ro', 'ru', 'sk', 'sl', 'so', 'sq', 'sv', 'sw', 'ta', 'te', 'th',
+    'tl', 'tr', 'uk', 'ur', 'vi', 'zh-cn', 'zh-tw',
+])
+
+# properties of cookie notices and clickables that could not be retrieved,
+# the results are mutated, therefore only copies of these may be returned
+EMPTY_COOKIE_NOTICE_PROPERTIES = dict.fromkeys([
+        'html', 'has_id', 'has_class', 'unique_class_combinations',
+        'unique_attribute_combinations', 'id', 'class', 'text',
+        'fontsize', 'width', 'height', 'x', 'y', 'node_id', 'clickables',
+        'is_page_modal'])
+EMPTY_CLICKABLE_PROPERTIES = dict.fromkeys([
+        'html', 'node', 'type', 'text', 'value', 'fontsize', 'width', 'height', 'x', 'y',
+        'is_visible', 'node_id'])
+
+
+# Source: https://stackoverflow.com/a/41698614
+# adapted to also look at child nodes (especially important for fixed 
+# elements as they might not be "visible" themselves when they have no 
+# width or height)
+IS_VISIBLE_JS_FUNCTION = """
+    function isVisible(elem) {
+        function parseValue(value) {
+            var parsedValue = parseInt(value);
+            if (isNaN(parsedValue)) {
+                return 0;
+            } else {
+                return parsedValue;
+            }
+        }
+
+        if (!elem) elem = this;
+
+        // the elements are checked in document order with an explicit stack,
+        // the childs of an element are only checked if it is not visible
+        const stack = [elem];
+        while (stack.length > 0) {
+            elem = stack.pop();
+            if (!(elem instanceof Element)) continue;
+            let visible = true;
+            const style = getComputedStyle(elem);
+
+            // for these rules the childs cannot be visible, skip the subtree
+            if (style.display === 'none') continue;
+            if (style.opacity < 0.1) continue;
+            if (style.visibility !== 'visible') continue;
+
+            // for these rules a child element might still be visible,
+            // we need to also look at the childs, no direct return
+            const rect = elem.getBoundingClientRect();
+            if (elem.offsetWidth + elem.offsetHeight + rect.height + rect.width === 0) {
+                visible = false;
+            }
+            if (elem.offsetWidth < 10 || elem.offsetHeight < 10) {
+                visible = false;
+            }
+            const elemCenter = {
+                x: rect.left + elem.offsetWidth / 2,
+                y: rect.top + elem.offsetHeight / 2
+            };
+            if (elemCenter.x < 0) visible = false;
+            if (elemCenter.x > (document.documentElement.clientWidth || window.innerWidth)) visible = false;
+            if (elemCenter.y < 0) visible = false;
+            if (elemCenter.y > (document.documentElement.clientHeight || window.innerHeight)) visible = false;
+
+            if (visible) {
+                let pointContainer = document.elementFromPoint(elemCenter.x, elemCenter.y);
+                do {
+                    if (pointContainer === elem) return elem;
+                    if (!pointContainer) break;
+                } while (pointContainer = pointContainer.parentNode);
+
+                pointContainer = document.elementFromPoint(elemCenter.x, elemCenter.y - (parseValue(style.fontSize)/2));
+                do {
+                    if (pointContainer === elem) return elem;
+                    if (!pointContainer) break;
+                } while (pointContainer = pointContainer.parentNode);
+            }
+
+            // check the child elements (text nodes are never visible)
+            if (!visible) {
+                for (let i = elem.children.length - 1; i >= 0; i--) {
+                    stack.push(elem.children[i]);
+                }
+            }
+        }
+
+        return false;
+    }"""
+
+
+# tests whether the page is modal, i.e. whether the page is covered by one
+# element (besides the given cookie notice)
+IS_PAGE_MODAL_JS_FUNCTION = """
+    function isPageModal(cookieNotice) {
+        let margin = 5;
+
+        let viewportWidth = document.documentElement.clientWidth;
+        let viewportHeight = document.documentElement.clientHeight;
+        let viewportHorizontalCenter = viewportWidth / 2;
+        let viewportVerticalCenter = viewportHeight / 2;
+
+        let testPositions = [
+            {'x': margin, 'y': margin},
+            {'x': margin, 'y': viewportVerticalCenter},
+            {'x': margin, 'y': viewportHeight - margin},
+            {'x': viewportVerticalCenter, 'y': margin},
+            {'x': viewportVerticalCenter, 'y': viewportHeight - margin},
+            {'x': viewportWidth - margin, 'y': margin},
+            {'x': viewportWidth - margin, 'y': viewportVerticalCenter},
+            {'x': viewportWidth - margin, 'y': viewportHeight - margin},
+        ];
+
+        if (cookieNotice) {
+            if (cookieNotice.width == 'full') {
+                cookieNotice.width = viewportWidth;
+            }
+            if (cookieNotice.height == 'full') {
+                cookieNotice.height = viewportHeight;
+            }
+            testPositions = testPositions.filter(function(testPosition) {
+                return !((testPosition.x >= cookieNotice.x && testPosition.x <= (cookieNotice.x + cookieNotice.width)) &&
+                        (testPosition.y >= cookieNotice.y && testPosition.y <= (cookieNotice.y + cookieNotice.height)));
+            });
+        }
+
+        // a single position is always covered by one element
+        if (testPositions.length < 2) {
+            return true;
+        }
+
+        let previousContainer = document.elementFromPoint(testPositions[0].x, testPositions[0].y);
+        for (var i = 1; i < testPositions.length; i++) {
+            let testPosition = testPositions[i];
+            let testContainer = document.elementFromPoint(testPosition.x, testPosition.y);
+            if (previousContainer !== testContainer) {
+                return false;
+            }
+            previousContainer = testContainer;
+        }
+        return true;
+    }"""
+
+
+@lru_cache(maxsize=1)
+def _load_fasttext_model():
+    """Loads the fastText language identification model once per process.
+
+    Returns `None` if fastText is not installed or the model does not exist.
+    """
+    if fasttext is None or not os.path.isfile(FASTTEXT_MODEL_FILENAME):
+        return None
+    return fasttext.load_model(FASTTEXT_MODEL_FILENAME)
+
+
+def _get_xpath_string_literal(string):
+    """Returns the string as XPath string literal.
+
+    XPath 1.0 has no escape sequences, therefore strings that contain both
+    quote characters are built with `concat()`.
+    """
+    if "'" not in string:
+        return f"'{string}'"
+    if '"' not in string:
+        return f'"{string}"'
+    return "concat('" + "', \"'\", '".join(string.split("'")) + "')"
+
+
+@lru_cache(maxsize=None)
+def _load_abp_filters(abp_filter_filenames):
+    """Parses the AdblockPlus filter lists once per process.
+
+    If the lists are parsed before the worker processes are forked, the
+    workers inherit the parsed filters.
+    """
+    return {
+            os.path.splitext(os.path.basename(abp_filter_filename))[0]: AdblockPlusFilter(abp_filter_filename)
+            for abp_filter_filename in abp_filter_filenames
+        }
+
+
+def _get_json_data(obj):
+    """Returns the fields of the object that are stored in the results.
+
+    Fields listed in the `_json_excluded_fields` of the object are skipped.
+    """
+    excluded_fields = getattr(obj, '_json_excluded_fields', frozenset())
+    return {k: v for k, v in obj.__dict__.items() if k not in excluded_fields}
+
 
 class Webpage:
     def __init__(self, rank=None, domain='', protocol='https'):
@@ -50,6 +274,10 @@ class Webpage:
 
 
 class WebpageResult:
+    # fields that are not stored in the results, 
+    # see `exclude_field_from_json` for excluding further fields
+    _json_excluded_fields = frozenset(['_json_excluded_fields', 'screenshots'])
+
     def __init__(self, webpage):
         self.rank = webpage.rank
         self.domain = webpage.domain
@@ -80,8 +308,6 @@ class WebpageResult:
         self.cookie_notice_count = {}
         self.cookie_notices = {}
 
-        self._json_excluded_fields = ['_json_excluded_fields', 'screenshots']
-
     def add_redirect(self, url, root_frame=True):
         self.redirects.append({
                 'url': url,
@@ -107,6 +333,10 @@ class WebpageResult:
         })
 
     def add_response(self, requested_url, status, mime_type, headers):
+        # the header names repeat in almost every response, 
+        # interning them avoids storing them again for every response
+        if headers is not None:
+            headers = {sys.intern(name): value for name, value in headers.items()}
         self.responses.append({
             'url': requested_url,
             'status': status,
@@ -118,7 +348,8 @@ class WebpageResult:
         self.cookies[key] = cookies
 
     def add_screenshot(self, name, screenshot):
-        self.screenshots[name] = screenshot
+        # screenshots are base64 encoded, we store the decoded png
+        self.screenshots[name] = b64decode(screenshot)
 
     def set_html(self, html):
         self.html = html
@@ -139,24 +370,29 @@ class WebpageResult:
 
     def _save_screenshot(self, name, screenshot, directory):
         with open(f'{directory}/{self._get_filename_for_screenshot(name)}', 'wb') as file:
-            file.write(base64.b64decode(screenshot))
+            file.write(screenshot)
 
     def _get_filename_for_screenshot(self, name):
         return f'{self.rank}-{self.domain}-{name}.png'
 
     def save_data(self, directory):
-        with open(f'{directory}/{self._get_filename_for_data()}', 'w', encoding='utf8') as file:
-            file.write(self._to_json())
+        filename = f'{directory}/{self._get_filename_for_data()}'
+        if orjson is not None:
+            # orjson is several times faster and directly returns utf-8 bytes
+            with open(filename, 'wb') as file:
+                file.write(orjson.dumps(_get_json_data(self), default=_get_json_data, 
+                                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            # the json is written directly to a buffered file instead of building
+            # the (possibly large) json string in memory first
+            with open(filename, 'w', encoding='utf8', buffering=1024*1024) as file:
+                json.dump(_get_json_data(self), file, indent=4, default=_get_json_data, ensure_ascii=False)
 
     def _get_filename_for_data(self):
         return f'{self.rank}-{self.domain}.json'
 
-    def _to_json(self):
-        results = {k: v for k, v in self.__dict__.items() if k not in self._json_excluded_fields}
-        return json.dumps(results, indent=4, default=lambda o: o.__dict__, ensure_ascii=False)
-
     def exclude_field_from_json(self, excluded_field):
-        self._json_excluded_fields.append(excluded_field)
+        self._json_excluded_fields = self._json_excluded_fields | {excluded_field}
 
 
 class Click:
@@ -167,23 +403,30 @@ class Click:
 
 
 class ClickResult:
+    # fields that are not stored in the results
+    _json_excluded_fields = frozenset(['_new_page_keys'])
+
     def __init__(self):
         self.cookies = {}
         self.new_pages = []
         self.cookie_notice_visible_after_click = None
         self.is_page_modal = None
 
+        # keys of the new pages to find duplicates without searching `new_pages`
+        self._new_page_keys = set()
+
     def set_cookies(self, key, cookies):
         self.cookies[key] = cookies
 
     def add_new_page(self, url, root_frame=True, new_window=False):
-        new_page = {
-                'url': url,
-                'root_frame': root_frame,
-                'new_window': new_window,
-            }
-        if new_page not in self.new_pages:
-            self.new_pages.append(new_page)
+        new_page_key = (url, root_frame, new_window)
+        if new_page_key not in self._new_page_keys:
+            self._new_page_keys.add(new_page_key)
+            self.new_pages.append({
+                    'url': url,
+                    'root_frame': root_frame,
+                    'new_window': new_window,
+                })
 
     def has_new_pages(self):
         return len(self.new_pages) > 0
@@ -196,15 +439,16 @@ class ClickResult:
 
 
 class Browser:
-    def __init__(self, abp_filter_filenames, debugger_url='http://127.0.0.1:9222'):
+    def __init__(self, abp_filter_filenames, debugger_url=f'http://127.0.0.1:{DEBUGGER_BASE_PORT}', record_all_response_headers=True,
+                 record_tracebacks=True, highlight_cookie_notices=True):
         # create a browser instance which controls chromium
         self.browser = pychrome.Browser(url=debugger_url)
+        self.record_all_response_headers = record_all_response_headers
+        self.record_tracebacks = record_tracebacks
+        self.highlight_cookie_notices = highlight_cookie_notices
 
         # create helpers
-        self.abp_filters = {
-                os.path.splitext(os.path.basename(abp_filter_filename))[0]: AdblockPlusFilter(abp_filter_filename) 
-                for abp_filter_filename in abp_filter_filenames
-            }
+        self.abp_filters = _load_abp_filters(tuple(abp_filter_filenames))
 
     def scan_page(self, webpage, do_click=False):
         """Tries to scan the webpage and returns the result of the scan.
@@ -215,23 +459,28 @@ class Browser:
         - http protocol without `www.` subdomain
         - http protocol with `www.` subdomain
 
-        The first scan whose result is not failed is returned.
+        The first scan whose result is not failed is returned. A possibility
+        is skipped if its host could not be resolved in a previous scan.
         """
-        result = self._scan_page(webpage).get_result()
+        result = None
+        unresolvable_hosts = set()
+        for protocol, subdomain in [('https', None), ('https', 'www'), ('http', None), ('http', 'www')]:
+            # only retry if the page could not be loaded
+            if result is not None and not (result.failed and (result.failed_reason == FAILED_REASON_LOADING or result.failed_reason == FAILED_REASON_TIMEOUT)):
+                break
+
+            webpage.set_protocol(protocol)
+            if subdomain is not None:
+                webpage.set_subdomain(subdomain)
+
+            # the host cannot be resolved with the other protocol either
+            host = urlparse(webpage.url).hostname
+            if host in unresolvable_hosts:
+                continue
 
-        # try https with subdomain www
-        if result.failed and (result.failed_reason == FAILED_REASON_LOADING or result.failed_reason == FAILED_REASON_TIMEOUT):
-            webpage.set_subdomain('www')
-            result = self._scan_page(webpage).get_result()
-        # try http without subdomain www
-        if result.failed and (result.failed_reason == FAILED_REASON_LOADING or result.failed_reason == FAILED_REASON_TIMEOUT):
-            webpage.remove_subdomain()
-            webpage.set_protocol('http')
-            result = self._scan_page(webpage).get_result()
-        # try http with www subdomain
-        if result.failed and (result.failed_reason == FAILED_REASON_LOADING or result.failed_reason == FAILED_REASON_TIMEOUT):
-            webpage.set_subdomain('www')
             result = self._scan_page(webpage).get_result()
+            if result.failed and result.failed_reason == FAILED_REASON_LOADING and result.failed_exception in HOST_LOADING_ERRORS:
+                unresolvable_hosts.add(host)
 
         if result.failed:
             return result
@@ -273,7 +522,10 @@ class Browser:
         tab = self.browser.new_tab()
 
         # scan the page
-        page_scanner = WebpageScanner(tab=tab, abp_filters=self.abp_filters, webpage=webpage)
+        page_scanner = WebpageScanner(tab=tab, abp_filters=self.abp_filters, webpage=webpage, 
+                                      record_all_response_headers=self.record_all_response_headers,
+                                      record_tracebacks=self.record_tracebacks,
+                                      highlight_cookie_notices=self.highlight_cookie_notices)
         page_scanner.scan(take_screenshots=take_screenshots, click=click)
 
         # close tab and obtain the results
@@ -289,15 +541,44 @@ class AdblockPlusFilter:
             # other type is url-pattern which is used to block script files
             self._rules = [rule for rule in parse_filterlist(filterlist) if isinstance(rule, Filter) and rule.selector.get('type') == 'css']
 
+        # rules without applicable domains are applicable for every domain,
+        # all other rules are indexed by the domains they are applicable for
+        self._universal_rule_indices = []
+        self._rule_indices_by_domain = defaultdict(list)
+        for rule_index, rule in enumerate(self._rules):
+            applicable_domains = self._get_applicable_domains(rule)
+            if len(applicable_domains) == 0:
+                self._universal_rule_indices.append(rule_index)
+            for applicable_domain in applicable_domains:
+                self._rule_indices_by_domain[applicable_domain].append(rule_index)
+
+        # the applicable rules are cached per domain, so the retries of a scan
+        # and further scans of the same domain do not need to look them up again
+        self._applicable_rules_by_domain = {}
+
     def get_applicable_rules(self, domain):
-        """Returns the rules of the filter that are applicable for the given domain."""
-        return [rule for rule in self._rules if self._is_rule_applicable(rule, domain)]
+        """Returns the rules of the filter that are applicable for the given domain.
 
-    def _is_rule_applicable(self, rule, domain):
-        """Tests whethere a given rule is applicable for the given domain."""
+        A rule is applicable for a domain if it is applicable for the domain
+        itself or for one of its parent domains (e.g. `example.com` for
+        `www.example.com`).
+        """
+        if domain not in self._applicable_rules_by_domain:
+            rule_indices = set(self._universal_rule_indices)
+            domain_labels = domain.split('.')
+            for i in range(len(domain_labels)):
+                rule_indices.update(self._rule_indices_by_domain.get('.'.join(domain_labels[i:]), []))
+            self._applicable_rules_by_domain[domain] = tuple(self._rules[rule_index] for rule_index in sorted(rule_indices))
+        return self._applicable_rules_by_domain[domain]
+
+    def _get_applicable_domains(self, rule):
+        """Returns the domains for which the given rule is applicable.
+
+        An empty list is returned if the rule is applicable for all domains.
+        """
         domain_options = [(key, value) for key, value in rule.options if key == 'domain']
         if len(domain_options) == 0:
-            return True
+            return []
 
         # there is only one domain option
         _, domains = domain_options[0]
@@ -305,29 +586,28 @@ class AdblockPlusFilter:
         # filter exclusion rules as they should be ignored:
         # the cookie notices do exist, the ABP plugin is just not able
         # to remove them correctly
-        domains = [(opt_domain, opt_applicable) for opt_domain, opt_applicable in domains if opt_applicable == True]
-        if len(domains) == 0:
-            return True
-
-        # the list of domains now only consists of domains for which the rule
-        # is applicable, we check for the domain and return False otherwise
-        for opt_domain, _ in domains:
-            if opt_domain in domain:
-                return True
-        return False
+        return [opt_domain for opt_domain, opt_applicable in domains if opt_applicable == True]
 
 
 class WebpageScanner:
-    def __init__(self, tab, abp_filters, webpage):
+    def __init__(self, tab, abp_filters, webpage, record_all_response_headers=True, record_tracebacks=True,
+                 highlight_cookie_notices=True):
         self.tab = tab
         self.abp_filters = abp_filters
         self.webpage = webpage
+        self.record_all_response_headers = record_all_response_headers
+        self.record_tracebacks = record_tracebacks
+        self.highlight_cookie_notices = highlight_cookie_notices
         self.result = WebpageResult(webpage)
         self.click_result = ClickResult()
-        self.loaded_urls = []
+        self.first_level_domains = set()
+
+        # descriptions of nodes by node id, the node ids become invalid
+        # when the document is updated
+        self._node_descriptions = {}
 
     def scan(self, take_screenshots=True, click=None):
-        self._setup()
+        self._setup(take_screenshots=take_screenshots)
         
         try:
             # open url and wait for load event and js
@@ -355,12 +635,10 @@ class WebpageScanner:
 
         # stop the browser from executing javascript
         self.tab.Emulation.setScriptExecutionDisabled(value=True)
-        self.tab.wait(0.1)
 
         try:
             # clear the browser
             self._clear_browser()
-            self.tab.wait(0.1)
         except Exception as e:
             print(type(e).__name__)
             print(traceback.format_exc())
@@ -380,10 +658,10 @@ class WebpageScanner:
     # SETUP
     ############################################################################
 
-    def _setup(self):
-        # initialize `_is_loaded` variable to `False`
-        # it will be set to `True` when the `loadEventFired` event occurs
-        self._is_loaded = False
+    def _setup(self, take_screenshots=True):
+        # initialize the `_load_event` which is not set yet
+        # it will be set when the `loadEventFired` event occurs
+        self._load_event = threading.Event()
 
         # data about requests/repsonses
         self.recordRedirects = True
@@ -393,13 +671,12 @@ class WebpageScanner:
         self.frameId = None
 
         # setup the tab
-        self._setup_tab()
-        self.tab.wait(0.1)
+        self._setup_tab(enable_overlay=take_screenshots and self.highlight_cookie_notices)
 
         # deny permissions because they might pop-up and block detection
         #self._deny_permissions() # problems with ubuntu
 
-    def _setup_tab(self):
+    def _setup_tab(self, enable_overlay=True):
         # set callbacks for request and response logging
         self.tab.Network.requestWillBeSent = self._event_request_will_be_sent
         self.tab.Network.responseReceived = self._event_response_received
@@ -410,6 +687,7 @@ class WebpageScanner:
         self.tab.Page.navigatedWithinDocument = self._event_navigated_within_document
         self.tab.Page.windowOpen = self._event_window_open
         self.tab.Page.javascriptDialogOpening = self._event_javascript_dialog_opening
+        self.tab.DOM.documentUpdated = self._event_document_updated
         
         # start our tab after callbacks have been registered
         self.tab.start()
@@ -423,9 +701,11 @@ class WebpageScanner:
         self.tab.Page.enable()
 
         # enable DOM, Runtime and Overlay
+        # (Overlay is only needed to highlight nodes in screenshots)
         self.tab.DOM.enable()
         self.tab.Runtime.enable()
-        self.tab.Overlay.enable()
+        if enable_overlay:
+            self.tab.Overlay.enable()
 
     def _navigate_and_wait(self):
         try:
@@ -448,18 +728,9 @@ class WebpageScanner:
         self.tab.Network.clearBrowserCache()
         self.tab.Network.clearBrowserCookies()
 
-        # store all domains that were requested
-        first_level_domains = set()
-        for loaded_url in self.loaded_urls:
-            # invalid urls raise an exception
-            try:
-                first_level_domain = get_fld(loaded_url)
-                first_level_domains.add(first_level_domain)
-            except Exception:
-                pass
-
-        # clear the data for each domain
-        for first_level_domain in first_level_domains:
+        # clear the data for each domain that was requested
+        # (see `_event_response_received`)
+        for first_level_domain in list(self.first_level_domains):
             self.tab.Storage.clearDataForOrigin(origin='.' + first_level_domain, storageTypes='all')
 
     def _deny_permissions(self):
@@ -483,12 +754,7 @@ class WebpageScanner:
 
     def _wait_for_load_event(self, load_event_timeout):
         # we wait for the load event to be fired (see `_event_load_event_fired`)
-        waited = 0
-        while not self._is_loaded and waited < load_event_timeout:
-            self.tab.wait(0.1)
-            waited += 0.1
-
-        if waited >= load_event_timeout:
+        if not self._load_event.wait(load_event_timeout):
             self.result.set_stopped_waiting('load event')
             self.tab.Page.stopLoading()
 
@@ -522,12 +788,21 @@ class WebpageScanner:
         This includes the originating request which resulted in the
         response being received.
         """
-        self.loaded_urls.append(response['url'])
-
         url = response['url']
+
+        # store the domains that were requested, they are cleared after the scan
+        # (invalid urls do not have a first-level domain)
+        first_level_domain = get_fld(url, fail_silently=True)
+        if first_level_domain is not None:
+            self.first_level_domains.add(first_level_domain)
+
         mime_type = response['mimeType']
         status = response['status']
-        headers = response['headers']
+        # the headers of the other responses are only stored if requested
+        if self.record_all_response_headers or requestId == self.requestId:
+            headers = response['headers']
+        else:
+            headers = None
         self.result.add_response(requested_url=url, status=status, mime_type=mime_type, headers=headers)
 
         if requestId == self.requestId and (str(status).startswith('4') or str(status).startswith('5')):
@@ -539,9 +814,12 @@ class WebpageScanner:
 
     def _event_frame_started_loading(self, frameId, **kwargs):
         if self.recordNewPagesForClick and frameId == self.frameId:
-            self._is_loaded = False
+            self._load_event.clear()
             self.waitForNavigatedEvent = True
 
+    def _event_document_updated(self, **kwargs):
+        self._node_descriptions.clear()
+
     def _event_frame_requested_navigation(self, url, frameId, **kwargs):
         is_root_frame = (self.frameId == frameId)
         if self.recordNewPagesForClick:
@@ -564,7 +842,7 @@ class WebpageScanner:
         Note that this only means that all resources are loaded, the
         page may still process some JavaScript.
         """
-        self._is_loaded = True
+        self._load_event.set()
         self.recordRedirects = False
 
     def _event_javascript_dialog_opening(self, message, type, **kwargs):
@@ -656,55 +934,112 @@ class WebpageScanner:
         if take_screenshots:
             #self.tab.Page.bringToFront()
             self.take_screenshot('original')
+
+        # the screenshots with each cookie notice highlighted can be omitted,
+        # they need three calls per cookie notice
+        if take_screenshots and self.highlight_cookie_notices:
             for filter_name, cookie_notice_filter_node_ids in cookie_notice_filters.items():
                 self.take_screenshots_of_visible_nodes(cookie_notice_filter_node_ids, f'filter-{filter_name}')
             self.take_screenshots_of_visible_nodes(cookie_notice_fixed_node_ids, 'fixed_parent')
             self.take_screenshots_of_visible_nodes(cookie_notice_full_width_node_ids, 'full_width_parent')
 
     def get_properties_of_cookie_notices(self, node_ids):
-        return [self._get_properties_of_cookie_notice(node_id) for node_id in node_ids]
-
-    def _get_properties_of_cookie_notice(self, node_id):
         js_function = """
             function getCookieNoticeProperties(elem) {
                 if (!elem) elem = this;
                 const style = getComputedStyle(elem);
 
-                // Source: https://codereview.stackexchange.com/a/141854
-                function powerset(l) {
-                    return (function ps(list) {
-                        if (list.length === 0) {
-                            return [[]];
+                // returns the smallest combinations of the given items that are
+                // unique, only combinations of up to `maxSize` items are tested
+                // (testing all combinations is exponential in the number of items)
+                function getSmallestUniqueCombinations(items, isUnique) {
+                    const maxSize = 3;
+                    let combinations = items.map(function(item, index) { return [index]; });
+                    for (var size = 1; size <= maxSize && combinations.length > 0; size++) {
+                        let result = [];
+                        for (var i = 0; i < combinations.length; i++) {
+                            let combination = combinations[i].map(function(index) { return items[index]; });
+                            if (isUnique(combination)) {
+                                result.push(combination);
+                            }
+                        }
+                        if (result.length > 0) {
+                            return result;
                         }
-                        var head = list.pop();
-                        var tailPS = ps(list);
-                        return tailPS.concat(tailPS.map(function(e) { return [head].concat(e); }));
-                    })(l.slice());
-                }
 
-                function getUniqueClassCombinations(elem) {
-                    let result = [];
-                    let classCombinations = powerset(Array.from(elem.classList));
-                    for (var i = 0; i < classCombinations.length; i++) {
-                        let classCombination = classCombinations[i];
-                        if (classCombination.length == 0) {
-                            continue;
+                        // extend every combination by each item after its last item
+                        let nextCombinations = [];
+                        for (var i = 0; i < combinations.length; i++) {
+                            let lastIndex = combinations[i][combinations[i].length - 1];
+                            for (var j = lastIndex + 1; j < items.length; j++) {
+                                nextCombinations.push(combinations[i].concat([j]));
+                            }
                         }
-                        if (document.getElementsByClassName(classCombination.join(' ')).length == 1) {
-                            result.push(classCombination.join(' '));
+                        combinations = nextCombinations;
+                    }
+                    return [];
+                }
+
+                // the classes of all elements are indexed with one pass over the
+                // document instead of querying the document for each combination,
+                // the index is shared by all cookie notices of one call
+                function getClassIndex() {
+                    if (!getCookieNoticeProperties.classIndex) {
+                        // class names are case-insensitive in quirks mode
+                        const normalize = document.compatMode === 'BackCompat' ?
+                            function(className) { return className.toLowerCase(); } :
+                            function(className) { return className; };
+                        const classNamesByClass = new Map();
+                        const elements = document.getElementsByTagName('*');
+                        for (let i = 0; i < elements.length; i++) {
+                            const classNames = new Set(Array.from(elements[i].classList, normalize));
+                            for (const className of classNames) {
+                                let classNamesOfElements = classNamesByClass.get(className);
+                                if (!classNamesOfElements) {
+                                    classNamesOfElements = [];
+                                    classNamesByClass.set(className, classNamesOfElements);
+                                }
+                                classNamesOfElements.push(classNames);
+                            }
                         }
+                        getCookieNoticeProperties.classIndex = {
+                            normalize: normalize,
+                            classNamesByClass: classNamesByClass,
+                        };
                     }
-                    return result;
+                    return getCookieNoticeProperties.classIndex;
                 }
 
-                function getUniqueAttributeCombinations(elem) {
-                    function removeFromArray(array, item) {
-                        const index = array.indexOf(item);
-                        if (index > -1) {
-                            array.splice(index, 1);
+                // same as `document.getElementsByClassName(classCombination.join(' ')).length == 1`
+                function isClassCombinationUnique(classCombination) {
+                    const classIndex = getClassIndex();
+                    const classNames = classCombination.map(classIndex.normalize);
+
+                    // only the elements of the rarest class need to be checked
+                    let candidates = null;
+                    for (const className of classNames) {
+                        const classNamesOfElements = classIndex.classNamesByClass.get(className) || [];
+                        if (!candidates || classNamesOfElements.length < candidates.length) {
+                            candidates = classNamesOfElements;
                         }
                     }
 
+                    let count = 0;
+                    for (const classNamesOfElement of candidates) {
+                        if (classNames.every(function(className) { return classNamesOfElement.has(className); })) {
+                            count++;
+                            if (count > 1) return false;
+                        }
+                    }
+                    return count == 1;
+                }
+
+                function getUniqueClassCombinations(elem) {
+                    let classCombinations = getSmallestUniqueCombinations(Array.from(elem.classList), isClassCombinationUnique);
+                    return classCombinations.map(function(classCombination) { return classCombination.join(' '); });
+                }
+
+                function getUniqueAttributeCombinations(elem) {
                     let attributes = Array.from(elem.attributes);
                     let attributeNames = [];
                     for (var i = 0; i < attributes.length; i++) {
@@ -715,28 +1050,19 @@ class WebpageScanner:
                         attributeNames.push(attributeName);
                     }
 
-                    let result = [];
-                    let attributeCombinations = powerset(attributeNames);
-                    for (var i = 0; i < attributeCombinations.length; i++) {
-                        let attributeCombination = attributeCombinations[i];
-                        if (attributeCombination.length == 0) {
-                            continue;
-                        }
-
+                    let attributeCombinations = getSmallestUniqueCombinations(attributeNames, function(attributeCombination) {
                         let selector = '';
                         for (var j = 0; j < attributeCombination.length; j++) {
                             let attributeName = attributeCombination[j];
                             let attributeValue = elem.getAttribute(attributeName);
                             selector += '[' + attributeName + '="' + attributeValue.replace(/"/g, '\\\\"') + '"]';
                         }
-                        console.log(selector);
-                        if (document.querySelectorAll(selector).length == 1) {
-                            result.push(attributeCombination.join(' '));
-                        }
-                    }
-                    return result;
+                        return document.querySelectorAll(selector).length == 1;
+                    });
+                    return attributeCombinations.map(function(attributeCombination) { return attributeCombination.join(' '); });
                 }
 
+                const rect = elem.getBoundingClientRect();
                 let width = elem.offsetWidth;
                 if (width >= document.documentElement.clientWidth) {
                     width = 'full';
@@ -758,41 +1084,49 @@ class WebpageScanner:
                     'fontsize': style.fontSize,
                     'width': width,
                     'height': height,
-                    'x': elem.getBoundingClientRect().left,
-                    'y': elem.getBoundingClientRect().top,
+                    'x': rect.left,
+                    'y': rect.top,
                 };
             }"""
 
+        # the properties of all cookie notices are retrieved with one call
+        node_ids = list(node_ids)
+        cookie_notices_properties = self._call_function_on_nodes(js_function, node_ids, '_get_cookie_notice_properties')
+        cookie_notices = [self._get_properties_of_cookie_notice(node_id, cookie_notice_properties) 
+                          for node_id, cookie_notice_properties in zip(node_ids, cookie_notices_properties)]
+
+        # the modality of the page is checked in the top-level document (also
+        # for cookie notices in iframes) with one call for all cookie notices
+        retrieved_cookie_notices = [cookie_notice for cookie_notice in cookie_notices if cookie_notice.get('node_id') is not None]
+        for cookie_notice, is_page_modal in zip(retrieved_cookie_notices, self.are_pages_modal(retrieved_cookie_notices)):
+            cookie_notice['is_page_modal'] = is_page_modal
+        return cookie_notices
+
+    def _get_properties_of_cookie_notice(self, node_id, cookie_notice_properties):
+        # the properties could not be retrieved, the warning was already added
+        if cookie_notice_properties is None:
+            return self._get_empty_properties_of_cookie_notice()
+
         try:
             clickables = self.find_clickables_in_node(node_id)
             clickables_properties = self.get_properties_of_clickables(clickables)
 
-            remote_object_id = self._get_remote_object_id_by_node_id(node_id)
-            result = self.tab.Runtime.callFunctionOn(functionDeclaration=js_function, objectId=remote_object_id, silent=True).get('result')
-            cookie_notice_properties = self._get_object_for_remote_object(result.get('objectId'))
             cookie_notice_properties['node_id'] = node_id
             cookie_notice_properties['clickables'] = clickables_properties
-            cookie_notice_properties['is_page_modal'] = self.is_page_modal({
-                    'x': cookie_notice_properties.get('x'),
-                    'y': cookie_notice_properties.get('y'),
-                    'width': cookie_notice_properties.get('width'),
-                    'height': cookie_notice_properties.get('height'),
-                })
             return cookie_notice_properties
         except pychrome.exceptions.CallMethodException as e:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': '_get_cookie_notice_properties',
             })
-            cookie_notice_properties = dict.fromkeys([
-                    'html', 'has_id', 'has_class', 'unique_class_combinations',
-                    'unique_attribute_combinations', 'id', 'class', 'text',
-                    'fontsize', 'width', 'height', 'x', 'y', 'node_id', 'clickables',
-                    'is_page_modal'])
-            cookie_notice_properties['clickables'] = []
-            return cookie_notice_properties
+            return self._get_empty_properties_of_cookie_notice()
+
+    def _get_empty_properties_of_cookie_notice(self):
+        cookie_notice_properties = dict(EMPTY_COOKIE_NOTICE_PROPERTIES)
+        cookie_notice_properties['clickables'] = []
+        return cookie_notice_properties
 
 
     ############################################################################
@@ -802,13 +1136,31 @@ class WebpageScanner:
     def detect_language(self):
         try:
             result = self.tab.Runtime.evaluate(expression='document.body.innerText').get('result')
-            language = detect(result.get('value'))
+            text = result.get('value')
+
+            # fastText is much faster than langdetect, the beginning of the
+            # text is sufficient to identify the language
+            # (langdetect is used if fastText is not available or fails, e.g.
+            # fastText 0.9.x raises a ValueError with NumPy 2, or if it
+            # returns a language that langdetect does not know)
+            language = None
+            fasttext_model = _load_fasttext_model()
+            if fasttext_model is not None:
+                try:
+                    labels, _ = fasttext_model.predict(text[:4096].replace('\n', ' '))
+                    language = labels[0].replace('__label__', '')
+                except Exception:
+                    language = None
+            if language not in LANGDETECT_LANGUAGES:
+                language = None
+            if language is None:
+                language = detect(text)
             self.result.set_language(language)
         except Exception as e:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': 'detect_language',
             })
 
@@ -824,8 +1176,13 @@ class WebpageScanner:
         # see for explanation:
         # - https://stackoverflow.com/a/2994336
         # - https://stackoverflow.com/a/11744783
+        # script and style nodes are excluded in the query, so the results do
+        # not need to be checked node by node
+        # the search is done by the DOM domain (and not with `document.evaluate`)
+        # because it also searches the documents of iframes, the search string
+        # cannot be passed as argument and is inserted as XPath string literal
         search_object = self.tab.DOM.performSearch(
-                query="//body//*/text()[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '" + search_string + "')]/parent::*")
+                query="//body//*[not(self::script) and not(self::style)]/text()[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), " + _get_xpath_string_literal(search_string) + ")]/parent::*")
 
         node_ids = []
         if search_object.get('resultCount') != 0:
@@ -835,9 +1192,6 @@ class WebpageScanner:
                     toIndex=int(search_object.get('resultCount')))
             node_ids = search_results.get('nodeIds')
 
-        # remove script and style nodes
-        node_ids = [node_id for node_id in node_ids if not self._is_script_or_style_node(node_id)]
-
         # resume execution of scripts
         self.tab.Emulation.setScriptExecutionDisabled(value=False)
 
@@ -869,7 +1223,7 @@ class WebpageScanner:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': 'find_parent_block_element',
             })
             return None
@@ -880,14 +1234,6 @@ class WebpageScanner:
     ############################################################################
 
     def find_cookie_notices_by_full_width_parent(self, cookie_node_ids):
-        cookie_notice_full_width_node_ids = set()
-        for node_id in cookie_node_ids:
-            fwp_result = self._find_full_width_parent(node_id)
-            if fwp_result.get('parent_node_exists'):
-                cookie_notice_full_width_node_ids.add(fwp_result.get('parent_node'))
-        return cookie_notice_full_width_node_ids
-
-    def _find_full_width_parent(self, node_id):
         js_function = """
             function findFullWidthParent(elem) {
                 function parseValue(value) {
@@ -899,22 +1245,33 @@ class WebpageScanner:
                     }
                 }
 
+                // the computed style of each element is only requested once
+                const styles = new WeakMap();
+                function getStyle(elem) {
+                    let style = styles.get(elem);
+                    if (!style) {
+                        style = getComputedStyle(elem);
+                        styles.set(elem, style);
+                    }
+                    return style;
+                }
+
                 function getWidth(elem) {
-                    const style = getComputedStyle(elem);
+                    const style = getStyle(elem);
                     return elem.clientWidth +
                         parseValue(style.borderLeftWidth) + parseValue(style.borderRightWidth) +
                         parseValue(style.marginLeft) + parseValue(style.marginRight);
                 }
 
                 function getHeight(elem) {
-                    const style = getComputedStyle(elem);
+                    const style = getStyle(elem);
                     return elem.clientHeight +
                         parseValue(style.borderTopWidth) + parseValue(style.borderBottomWidth) +
                         parseValue(style.marginTop) + parseValue(style.marginBottom);
                 }
 
                 function getVerticalSpacing(elem) {
-                    const style = getComputedStyle(elem);
+                    const style = getStyle(elem);
                     return parseValue(style.paddingTop) + parseValue(style.paddingBottom) +
                         parseValue(style.borderTopWidth) + parseValue(style.borderBottomWidth) +
                         parseValue(style.marginTop) + parseValue(style.marginBottom);
@@ -938,8 +1295,8 @@ class WebpageScanner:
                 }
 
                 function getPositionSpacing(outerElem, innerElem) {
-                    const outerStyle = getComputedStyle(outerElem);
-                    const innerStyle = getComputedStyle(innerElem);
+                    const outerStyle = getStyle(outerElem);
+                    const innerStyle = getStyle(innerElem);
                     return parseValue(innerStyle.marginTop) +
                         parseValue(outerStyle.paddingTop) + parseValue(outerStyle.borderTopWidth)
                 }
@@ -966,33 +1323,10 @@ class WebpageScanner:
                 }
             }"""
 
-        try:
-            remote_object_id = self._get_remote_object_id_by_node_id(node_id)
-            result = self.tab.Runtime.callFunctionOn(functionDeclaration=js_function, objectId=remote_object_id, silent=True).get('result')
-
-            # if a boolean is returned, we did not find a full-width small parent
-            if result.get('type') == 'boolean':
-                return {
-                    'parent_node_exists': result.get('value'),
-                    'parent_node': None,
-                }
-            # otherwise, we found one
-            else:
-                return {
-                    'parent_node_exists': True,
-                    'parent_node': self._get_node_id_for_remote_object(result.get('objectId')),
-                }
-        except pychrome.exceptions.CallMethodException as e:
-            self.result.add_warning({
-                'message': str(e),
-                'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
-                'method': '_find_full_width_parent',
-            })
-            return {
-                'parent_node_exists': False,
-                'parent_node': None,
-            }
+        # if `false` is returned, we did not find a full-width small parent
+        parent_node_ids = self._call_function_on_nodes(js_function, list(cookie_node_ids), '_find_full_width_parent',
+                                                       return_nodes=True, unique_nodes=True)
+        return set(node_id for node_id in parent_node_ids if node_id is not None)
 
 
     ############################################################################
@@ -1000,14 +1334,6 @@ class WebpageScanner:
     ############################################################################
 
     def find_cookie_notices_by_fixed_parent(self, cookie_node_ids):
-        cookie_notice_fixed_node_ids = set()
-        for node_id in cookie_node_ids:
-            fp_result = self._find_fixed_parent(node_id)
-            if fp_result.get('has_fixed_parent'):
-                cookie_notice_fixed_node_ids.add(fp_result.get('fixed_parent'))
-        return cookie_notice_fixed_node_ids
-
-    def _find_fixed_parent(self, node_id):
         js_function = """
             function findFixedParent(elem) {
                 if (!elem) elem = this;
@@ -1021,16 +1347,25 @@ class WebpageScanner:
                 return elem; // html node
             }"""
 
-        try:
-            remote_object_id = self._get_remote_object_id_by_node_id(node_id)
-            result = self.tab.Runtime.callFunctionOn(functionDeclaration=js_function, objectId=remote_object_id, silent=True).get('result')
-            result_node_id = self._get_node_id_for_remote_object(result.get('objectId'))
+        result_node_ids = self._call_function_on_nodes(js_function, list(cookie_node_ids), '_find_fixed_parent',
+                                                       return_nodes=True, unique_nodes=True)
 
+        cookie_notice_fixed_node_ids = set()
+        for result_node_id in set(result_node_ids):
+            if result_node_id is None:
+                continue
+            fp_result = self._get_fixed_parent(result_node_id)
+            if fp_result.get('has_fixed_parent'):
+                cookie_notice_fixed_node_ids.add(fp_result.get('fixed_parent'))
+        return cookie_notice_fixed_node_ids
+
+    def _get_fixed_parent(self, result_node_id):
+        try:
             # if the returned parent element is an html element,
             # no fixed parent element was found
             if self._is_html_node(result_node_id):
                 html_node_id = result_node_id
-                html_node = self.tab.DOM.describeNode(nodeId=html_node_id).get('node')
+                html_node = self._describe_node(html_node_id)
 
                 # if the html element is the root html element, we have not found
                 # a fixed parent
@@ -1056,8 +1391,8 @@ class WebpageScanner:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
-                'method': '_find_fixed_parent',
+                'traceback': self._format_traceback(),
+                'method': '_get_fixed_parent',
             })
             return {
                 'has_fixed_parent': False,
@@ -1082,16 +1417,26 @@ class WebpageScanner:
         js_function = """
             (function() {
                 let rules = """ + rules_js + """;
-                let cookie_notices = [];
 
-                rules.forEach(function(rule) {
-                    let elements = document.querySelectorAll(rule);
-                    elements.forEach(function(element) {
-                        cookie_notices.push(element);
-                    });
-                });
+                // the rules are combined into one selector, so the document is
+                // only matched once; if a rule is not a valid selector, the
+                // rules are split in halves until the invalid rule is found
+                function querySelectorAllOfRules(rules) {
+                    if (rules.length == 0) {
+                        return [];
+                    }
+                    try {
+                        return Array.from(document.querySelectorAll(rules.join(',')));
+                    } catch (e) {
+                        if (rules.length == 1) {
+                            return [];
+                        }
+                        let middle = Math.floor(rules.length / 2);
+                        return querySelectorAllOfRules(rules.slice(0, middle)).concat(querySelectorAllOfRules(rules.slice(middle)));
+                    }
+                }
 
-                return cookie_notices;
+                return querySelectorAllOfRules(rules);
             })();"""
 
         query_result = self.tab.Runtime.evaluate(expression=js_function).get('result')
@@ -1119,20 +1464,17 @@ class WebpageScanner:
         js_function = """
             function findClickablesInElement(elem) {
                 function findCoveringNodes(nodes) {
-                    let covering_nodes = Array.from(nodes);
-
-                    for (var i = 0; i < nodes.length; i++) {
-                        let node1 = nodes[i];
-                        for (var j = 0; j < nodes.length; j++) {
-                            let node2 = nodes[j];
-                            // check whether node2 is contained in node1, if yes remove
-                            if (node1 !== node2 && node1.contains(node2)) {
-                                const index = covering_nodes.indexOf(node2);
-                                covering_nodes.splice(index, 1);
+                    // a node is removed if it is contained in another node,
+                    // i.e. if one of its ancestors (up to `elem`) is in `nodes`
+                    const nodeSet = new Set(nodes);
+                    return Array.from(nodes).filter(function(node) {
+                        for (let ancestor = node.parentNode; ancestor && ancestor !== elem; ancestor = ancestor.parentNode) {
+                            if (nodeSet.has(ancestor)) {
+                                return false;
                             }
                         }
-                    }
-                    return covering_nodes;
+                        return true;
+                    });
                 }
 
                 if (!elem) elem = this;
@@ -1148,20 +1490,20 @@ class WebpageScanner:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': 'find_clickables_in_node',
             })
             return []
 
     def get_properties_of_clickables(self, node_ids):
-        return [self._get_properties_of_clickable(node_id) for node_id in node_ids]
-
-    def _get_properties_of_clickable(self, node_id):
         js_function = """
             function getPropertiesOfClickable(elem) {
+                const isVisible = """ + IS_VISIBLE_JS_FUNCTION + """;
+
                 if (!elem) elem = this;
 
                 const style = getComputedStyle(elem);
+                const rect = elem.getBoundingClientRect();
 
                 let clickable_type;
                 if (elem.localName == 'a' || elem.getAttribute('role') == 'link') {
@@ -1179,28 +1521,26 @@ class WebpageScanner:
                     'fontsize': style.fontSize,
                     'width': elem.offsetWidth,
                     'height': elem.offsetHeight,
-                    'x': elem.getBoundingClientRect().left,
-                    'y': elem.getBoundingClientRect().top,
+                    'x': rect.left,
+                    'y': rect.top,
+                    'is_visible': isVisible(elem) !== false,
                 };
             }"""
 
-        try:
-            remote_object_id = self._get_remote_object_id_by_node_id(node_id)
-            result = self.tab.Runtime.callFunctionOn(functionDeclaration=js_function, objectId=remote_object_id, silent=True).get('result')
-            properties_of_clickable = self._get_object_for_remote_object(result.get('objectId'))
-            properties_of_clickable['node_id'] = node_id
-            properties_of_clickable['is_visible'] = self.is_node_visible(node_id).get('is_visible')
-            return properties_of_clickable
-        except pychrome.exceptions.CallMethodException as e:
-            self.result.add_warning({
-                'message': str(e),
-                'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
-                'method': '_get_cookie_notice_properties',
-            })
-            return dict.fromkeys([
-                'html', 'node', 'type', 'text', 'value', 'fontsize', 'width', 'height', 'x', 'y',
-                'node_id', 'is_visible'])
+        # the properties (including the visibility) of all clickables are 
+        # retrieved with one call
+        node_ids = list(node_ids)
+        clickables_properties = self._call_function_on_nodes(js_function, node_ids, '_get_properties_of_clickable')
+        return [self._get_properties_of_clickable(node_id, properties_of_clickable)
+                for node_id, properties_of_clickable in zip(node_ids, clickables_properties)]
+
+    def _get_properties_of_clickable(self, node_id, properties_of_clickable):
+        # the properties could not be retrieved, the warning was already added
+        if properties_of_clickable is None:
+            return dict(EMPTY_CLICKABLE_PROPERTIES)
+
+        properties_of_clickable['node_id'] = node_id
+        return properties_of_clickable
 
     def _click_node(self, node_id):
         js_function = """
@@ -1217,7 +1557,7 @@ class WebpageScanner:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': '_click_node',
             })
             return False
@@ -1228,112 +1568,32 @@ class WebpageScanner:
     ############################################################################
 
     def _filter_visible_nodes(self, node_ids):
-        return [node_id for node_id in node_ids if self.is_node_visible(node_id).get('is_visible')]
-
-    def is_node_visible(self, node_id):
-        # Source: https://stackoverflow.com/a/41698614
-        # adapted to also look at child nodes (especially important for fixed 
-        # elements as they might not be "visible" themselves when they have no 
-        # width or height)
         js_function = """
-            function isVisible(elem) {
-                function parseValue(value) {
-                    var parsedValue = parseInt(value);
-                    if (isNaN(parsedValue)) {
-                        return 0;
-                    } else {
-                        return parsedValue;
-                    }
-                }
-
-                if (!elem) elem = this;
-                if (!(elem instanceof Element)) return false;
-                let visible = true;
-                const style = getComputedStyle(elem);
-
-                // for these rules the childs cannot be visible, directly return
-                if (style.display === 'none') return false;
-                if (style.opacity < 0.1) return false;
-                if (style.visibility !== 'visible') return false;
-
-                // for these rules a child element might still be visible,
-                // we need to also look at the childs, no direct return
-                if (elem.offsetWidth + elem.offsetHeight + elem.getBoundingClientRect().height +
-                    elem.getBoundingClientRect().width === 0) {
-                    visible = false;
-                }
-                if (elem.offsetWidth < 10 || elem.offsetHeight < 10) {
-                    visible = false;
-                }
-                const elemCenter = {
-                    x: elem.getBoundingClientRect().left + elem.offsetWidth / 2,
-                    y: elem.getBoundingClientRect().top + elem.offsetHeight / 2
-                };
-                if (elemCenter.x < 0) visible = false;
-                if (elemCenter.x > (document.documentElement.clientWidth || window.innerWidth)) visible = false;
-                if (elemCenter.y < 0) visible = false;
-                if (elemCenter.y > (document.documentElement.clientHeight || window.innerHeight)) visible = false;
-
-                if (visible) {
-                    let pointContainer = document.elementFromPoint(elemCenter.x, elemCenter.y);
-                    do {
-                        if (pointContainer === elem) return elem;
-                        if (!pointContainer) break;
-                    } while (pointContainer = pointContainer.parentNode);
-
-                    pointContainer = document.elementFromPoint(elemCenter.x, elemCenter.y - (parseValue(style.fontSize)/2));
-                    do {
-                        if (pointContainer === elem) return elem;
-                        if (!pointContainer) break;
-                    } while (pointContainer = pointContainer.parentNode);
-                }
-
-                // check the child nodes
-                if (!visible) {
-                    let childrenCount = elem.childNodes.length;
-                    for (var i = 0; i < childrenCount; i++) {
-                        let isChildVisible = isVisible(elem.childNodes[i]);
-                        if (isChildVisible) {
-                            return isChildVisible;
-                        }
-                    }
-                }
-
-                return false;
+            function(elem) {
+                const isVisible = """ + IS_VISIBLE_JS_FUNCTION + """;
+                return isVisible(elem) !== false;
             }"""
 
-        # the function `isVisible` is calling itself recursively, 
-        # therefore it needs to be defined beforehand
-        self.tab.Runtime.evaluate(expression=js_function)
+        # the visibility of all nodes is checked with one call
+        node_ids = list(node_ids)
+        visibilities = self._call_function_on_nodes(js_function, node_ids, 'is_node_visible')
+        return [node_id for node_id, is_visible in zip(node_ids, visibilities) if is_visible]
 
-        try:
-            # call the function `isVisible` on the node
-            remote_object_id = self._get_remote_object_id_by_node_id(node_id)
-            result = self.tab.Runtime.callFunctionOn(functionDeclaration=js_function, objectId=remote_object_id, silent=True).get('result')
+    def is_node_visible(self, node_id):
+        visible_node_id = self.get_visible_nodes([node_id])[0]
+        return {
+            'is_visible': visible_node_id is not None,
+            'visible_node': visible_node_id,
+        }
 
-            # if a boolean is returned, the object is not visible
-            if result.get('type') == 'boolean':
-                return {
-                    'is_visible': result.get('value'),
-                    'visible_node': None,
-                }
-            # otherwise, the object or one of its children is visible
-            else:
-                return {
-                    'is_visible': True,
-                    'visible_node': self._get_node_id_for_remote_object(result.get('objectId')),
-                }
-        except pychrome.exceptions.CallMethodException as e:
-            self.result.add_warning({
-                'message': str(e),
-                'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
-                'method': 'is_node_visible',
-            })
-            return {
-                'is_visible': False,
-                'visible_node': None,
-            }
+    def get_visible_nodes(self, node_ids):
+        """Returns for each node the node itself or its first visible child.
+
+        The visibility of all nodes is checked with one call. The result is
+        `None` for each node that is not visible and has no visible child.
+        """
+        js_function = IS_VISIBLE_JS_FUNCTION
+        return self._call_function_on_nodes(js_function, list(node_ids), 'is_node_visible', return_nodes=True)
 
 
     ############################################################################
@@ -1343,59 +1603,49 @@ class WebpageScanner:
     def is_page_modal(self, cookie_notice=None):
         cookie_notice_js = json.dumps(cookie_notice)
 
-        js_function = """
-            (function modal() {
-                let margin = 5;
-                let cookieNotice = """ + cookie_notice_js + """;
-
-                let viewportWidth = document.documentElement.clientWidth;
-                let viewportHeight = document.documentElement.clientHeight;
-                let viewportHorizontalCenter = viewportWidth / 2;
-                let viewportVerticalCenter = viewportHeight / 2;
-
-                let testPositions = [
-                    {'x': margin, 'y': margin},
-                    {'x': margin, 'y': viewportVerticalCenter},
-                    {'x': margin, 'y': viewportHeight - margin},
-                    {'x': viewportVerticalCenter, 'y': margin},
-                    {'x': viewportVerticalCenter, 'y': viewportHeight - margin},
-                    {'x': viewportWidth - margin, 'y': margin},
-                    {'x': viewportWidth - margin, 'y': viewportVerticalCenter},
-                    {'x': viewportWidth - margin, 'y': viewportHeight - margin},
-                ];
-
-                if (cookieNotice) {
-                    if (cookieNotice.width == 'full') {
-                        cookieNotice.width = viewportWidth;
-                    }
-                    if (cookieNotice.height == 'full') {
-                        cookieNotice.height = viewportHeight;
-                    }
-                    for (var i = 0; i < testPositions.length; i++) {
-                        let testPosition = testPositions[i];
-                        if ((testPosition.x >= cookieNotice.x && testPosition.x <= (cookieNotice.x + cookieNotice.width)) &&
-                                (testPosition.y >= cookieNotice.y && testPosition.y <= (cookieNotice.y + cookieNotice.height))) {
-                            let index = testPositions.indexOf(testPosition);
-                            testPositions.splice(index, 1);
-                        }
-                    }
-                }
-
-                let previousContainer = document.elementFromPoint(testPositions[0].x, testPositions[0].y);
-                for (var i = 1; i < testPositions.length; i++) {
-                    let testPosition = testPositions[i];
-                    let testContainer = document.elementFromPoint(testPosition.x, testPosition.y);
-                    if (previousContainer !== testContainer) {
-                        return false;
-                    }
-                    previousContainer = testContainer;
-                }
-                return true;
-            })();"""
+        js_function = "(" + IS_PAGE_MODAL_JS_FUNCTION + ")(" + cookie_notice_js + ");"
 
         result = self.tab.Runtime.evaluate(expression=js_function).get('result')
         return result.get('value')
 
+    def are_pages_modal(self, cookie_notices):
+        """Returns for each cookie notice whether the page is modal (`None` if the check failed)."""
+        if len(cookie_notices) == 0:
+            return []
+
+        cookie_notices_js = json.dumps([{
+                'x': cookie_notice.get('x'),
+                'y': cookie_notice.get('y'),
+                'width': cookie_notice.get('width'),
+                'height': cookie_notice.get('height'),
+            } for cookie_notice in cookie_notices])
+
+        js_function = """
+            (function(cookieNotices) {
+                const isPageModal = """ + IS_PAGE_MODAL_JS_FUNCTION + """;
+
+                // a failed check must not prevent the checks of the other cookie notices
+                return cookieNotices.map(function(cookieNotice) {
+                    try {
+                        return isPageModal(cookieNotice);
+                    } catch (e) {
+                        return null;
+                    }
+                });
+            })(""" + cookie_notices_js + ");"
+
+        try:
+            result = self.tab.Runtime.evaluate(expression=js_function, returnByValue=True).get('result')
+            return result.get('value') or [None] * len(cookie_notices)
+        except pychrome.exceptions.CallMethodException as e:
+            self.result.add_warning({
+                'message': str(e),
+                'exception': type(e).__name__,
+                'traceback': self._format_traceback(),
+                'method': 'are_pages_modal',
+            })
+            return [None] * len(cookie_notices)
+
 
     ############################################################################
     # SCREENSHOTS
@@ -1404,18 +1654,32 @@ class WebpageScanner:
     def take_screenshots_of_visible_nodes(self, node_ids, name):
         # filter only visible nodes
         # and replace the original node_id with their visible children if the node itself is not visible
-        node_ids = [visibility.get('visible_node') for visibility in (self.is_node_visible(node_id) for node_id in node_ids) 
-                    if visibility and visibility.get('is_visible')]
+        node_ids = [visible_node_id for visible_node_id in self.get_visible_nodes(node_ids) if visible_node_id is not None]
         self.take_screenshots_of_nodes(node_ids, name)
 
     def take_screenshots_of_nodes(self, node_ids, name):
+        if len(node_ids) == 0:
+            return
+
+        # the highlighting does not change the layout, therefore the viewport
+        # is only requested once for all screenshots
+        screenshot_viewport = self._get_screenshot_viewport()
+
         # take a screenshot of the page with every node highlighted
         for index, node_id in enumerate(node_ids):
             self._highlight_node(node_id)
-            self.take_screenshot(name + '-' + str(index))
+            self.take_screenshot(name + '-' + str(index), screenshot_viewport)
             self._hide_highlight()
 
-    def take_screenshot(self, name):
+    def take_screenshot(self, name, screenshot_viewport=None):
+        if screenshot_viewport is None:
+            screenshot_viewport = self._get_screenshot_viewport()
+
+        # take screenshot and store it
+        # (the PNG is encoded with less compression, it stays lossless)
+        self.result.add_screenshot(name, self.tab.Page.captureScreenshot(clip=screenshot_viewport, format='png', optimizeForSpeed=True)['data'])
+
+    def _get_screenshot_viewport(self):
         # get the width and height of the viewport
         layout_metrics = self.tab.Page.getLayoutMetrics()
         viewport = layout_metrics.get('layoutViewport')
@@ -1423,10 +1687,7 @@ class WebpageScanner:
         height = viewport.get('clientHeight')
         x = viewport.get('pageX')
         y = viewport.get('pageY')
-        screenshot_viewport = {'x': x, 'y': y, 'width': width, 'height': height, 'scale': 1}
-
-        # take screenshot and store it
-        self.result.add_screenshot(name, self.tab.Page.captureScreenshot(clip=screenshot_viewport)['data'])
+        return {'x': x, 'y': y, 'width': width, 'height': height, 'scale': 1}
 
     def _highlight_node(self, node_id):
         """Highlight the given node with an overlay."""
@@ -1458,58 +1719,135 @@ class WebpageScanner:
                 self.result.add_warning({
                     'message': str(e),
                     'exception': type(e).__name__,
-                    'traceback': traceback.format_exc().splitlines(),
+                    'traceback': self._format_traceback(),
                     'method': '_get_array_of_node_ids_for_remote_object',
                 })
         return node_ids
 
-    def _get_object_for_remote_object(self, remote_object_id):
-        object_attributes = self._get_properties_of_remote_object(remote_object_id)
-        result = {
-                attribute.get('name'): attribute.get('value').get('value')
-                for attribute in object_attributes
-                if self._is_remote_attribute_a_primitive(attribute)
-            }
+    def _get_node_ids_of_array_for_remote_object(self, remote_object_id):
+        """Returns the node id of each element of the array, `None` for elements that are not nodes."""
+        array_attributes = self._get_properties_of_remote_object(remote_object_id)
+        node_ids = []
+        for array_element in array_attributes:
+            if not array_element.get('enumerable'):
+                continue
+            value = array_element.get('value')
+            if value.get('subtype', '') == 'node':
+                node_ids.append(self._get_node_id_for_remote_object(value.get('objectId')))
+            else:
+                node_ids.append(None)
+        return node_ids
 
-        # search for nested objects
-        result.update({
-                attribute.get('name'): self._get_object_for_remote_object(attribute.get('value').get('objectId'))
-                for attribute in object_attributes
-                if self._is_remote_attribute_an_object(attribute)
-            })
+    def _call_function_on_nodes(self, js_function, node_ids, method, return_nodes=False, unique_nodes=False):
+        """Calls the JavaScript function for each node and returns the results by value.
+
+        The function is called once with all nodes. If the nodes cannot be
+        passed together (e.g. they are in different frames), the function is
+        called separately for each node. The result is `None` for each node
+        that could not be resolved or for which the call failed.
+
+        If `return_nodes` is set, the function is expected to return a node
+        and the node id of the returned node is returned instead (`None` if
+        no node was returned). If `unique_nodes` is set as well, a node that
+        is returned for several nodes is only resolved for the first of them
+        and `None` is returned for the others; this only applies if the
+        function is called once with all nodes, so callers have to
+        deduplicate the node ids themselves as well.
+        """
+        if len(node_ids) == 0:
+            return []
 
-        # search for nested arrays
-        result.update({
-                attribute.get('name'): self._get_array_for_remote_object(attribute.get('value').get('objectId'))
-                for attribute in object_attributes
-                if self._is_remote_attribute_an_array(attribute)
-            })
+        if return_nodes and unique_nodes:
+            js_function_for_nodes = """
+                function() {
+                    const f = """ + js_function + """;
+                    const seen = new Set();
+                    return Array.from(arguments).map(function(elem) {
+                        const result = elem ? f(elem) : null;
+                        if (result) {
+                            if (seen.has(result)) return null;
+                            seen.add(result);
+                        }
+                        return result;
+                    });
+                }"""
+        else:
+            js_function_for_nodes = """
+                function() {
+                    const f = """ + js_function + """;
+                    return Array.from(arguments).map(function(elem) {
+                        return elem ? f(elem) : null;
+                    });
+                }"""
 
-        return result
+        remote_object_ids = [self._get_remote_object_id_by_node_id(node_id) for node_id in node_ids]
+        for node_id, remote_object_id in zip(node_ids, remote_object_ids):
+            if remote_object_id is None:
+                self.result.add_warning({
+                    'message': f'Could not resolve node {node_id}',
+                    'exception': 'NodeNotResolved',
+                    'traceback': None,
+                    'method': method,
+                })
 
-    def _get_array_for_remote_object(self, remote_object_id):
-        array_attributes = self._get_properties_of_remote_object(remote_object_id)
-        return [
-                array_element.get('value').get('value')
-                for array_element in array_attributes
-                if array_element.get('enumerable')
-            ]
-
-    def _is_remote_attribute_a_primitive(self, attribute):
-        return attribute.get('enumerable') \
-               and attribute.get('value').get('type') != 'object' \
-               or attribute.get('value').get('subtype', '') == 'null'
-
-    def _is_remote_attribute_an_object(self, attribute):
-        return attribute.get('enumerable') \
-               and attribute.get('value').get('type') == 'object' \
-               and attribute.get('value').get('subtype', '') != 'array' \
-               and attribute.get('value').get('subtype', '') != 'null'
-
-    def _is_remote_attribute_an_array(self, attribute):
-        return attribute.get('enumerable') \
-               and attribute.get('value').get('type') == 'object' \
-               and attribute.get('value').get('subtype', '') == 'array'
+        if all(remote_object_id is None for remote_object_id in remote_object_ids):
+            return [None] * len(node_ids)
+
+        try:
+            results = self._call_function_with_remote_objects(js_function_for_nodes, remote_object_ids, return_nodes)
+            if results is not None:
+                return results
+        except pychrome.exceptions.CallMethodException:
+            pass
+
+        # call the function for each node separately
+        results = []
+        for node_id, remote_object_id in zip(node_ids, remote_object_ids):
+            if remote_object_id is None:
+                results.append(None)
+                continue
+            try:
+                result = self._call_function_with_remote_objects(js_function_for_nodes, [remote_object_id], return_nodes)
+                if result is None:
+                    self.result.add_warning({
+                        'message': f'JavaScript exception for node {node_id}',
+                        'exception': 'JavaScriptException',
+                        'traceback': None,
+                        'method': method,
+                    })
+                    results.append(None)
+                else:
+                    results.append(result[0])
+            except pychrome.exceptions.CallMethodException as e:
+                self.result.add_warning({
+                    'message': str(e),
+                    'exception': type(e).__name__,
+                    'traceback': self._format_traceback(),
+                    'method': method,
+                })
+                results.append(None)
+        return results
+
+    def _call_function_with_remote_objects(self, js_function, remote_object_ids, return_nodes=False):
+        """Calls the JavaScript function with the remote objects as arguments and returns the result by value.
+
+        Remote objects that are `None` are passed as `null`. `None` is
+        returned if the function threw an exception. If `return_nodes` is
+        set, the function has to return an array and the node ids of its
+        elements are returned.
+        """
+        response = self.tab.Runtime.callFunctionOn(
+                functionDeclaration=js_function,
+                objectId=next(remote_object_id for remote_object_id in remote_object_ids if remote_object_id is not None),
+                arguments=[{'objectId': remote_object_id} if remote_object_id is not None else {'value': None}
+                           for remote_object_id in remote_object_ids],
+                returnByValue=not return_nodes,
+                silent=True)
+        if response.get('exceptionDetails'):
+            return None
+        if return_nodes:
+            return self._get_node_ids_of_array_for_remote_object(response.get('result').get('objectId'))
+        return response.get('result').get('value')
 
     def _get_properties_of_remote_object(self, remote_object_id):
         return self.tab.Runtime.getProperties(objectId=remote_object_id, ownProperties=True).get('result')
@@ -1538,34 +1876,29 @@ class WebpageScanner:
     def _get_html_of_node(self, node_id):
         return self.tab.DOM.getOuterHTML(nodeId=node_id).get('outerHTML')
 
+    def _describe_node(self, node_id):
+        """Returns the description of the node, it is requested only once per node."""
+        node = self._node_descriptions.get(node_id)
+        if node is None:
+            node = self.tab.DOM.describeNode(nodeId=node_id).get('node')
+            self._node_descriptions[node_id] = node
+        return node
+
     def _get_node_name(self, node_id):
         try:
-            return self.tab.DOM.describeNode(nodeId=node_id).get('node').get('nodeName').lower()
+            return self._describe_node(node_id).get('nodeName').lower()
         except pychrome.exceptions.CallMethodException as e:
             self.result.add_warning({
                 'message': str(e),
                 'exception': type(e).__name__,
-                'traceback': traceback.format_exc().splitlines(),
+                'traceback': self._format_traceback(),
                 'method': '_get_node_name',
             })
             return None
 
-    def _is_script_or_style_node(self, node_id):
-        node_name = self._get_node_name(node_id)
-        return node_name == 'script' or node_name == 'style'
-
     def _is_html_node(self, node_id):
         return self._get_node_name(node_id) == 'html'
 
-    def _is_inline_element(self, node_id):
-        inline_elements = [
-            'a', 'abbr', 'acronym', 'b', 'bdo', 'big', 'br', 'button', 'cite',
-            'code', 'dfn', 'em', 'i', 'img', 'input', 'kbd', 'label', 'map',
-            'object', 'output', 'q', 'samp', 'script', 'select', 'small',
-            'span', 'strong', 'sub', 'sup', 'textarea', 'time', 'tt', 'var'
-        ]
-        return self._get_node_name(node_id) in inline_elements
-
 
     ############################################################################
     # MISC
@@ -1578,6 +1911,33 @@ class WebpageScanner:
     def _get_all_cookies(self):
         return self.tab.Network.getAllCookies().get('cookies')
 
+    def _format_traceback(self):
+        """Returns the lines of the traceback of the handled exception, `None` if tracebacks are not recorded."""
+        if not self.record_tracebacks:
+            return None
+        return traceback.format_exc().splitlines()
+
+
+# browser of the current worker process, it is created once per process in
+# `_init_worker` because the browser cannot be pickled
+_worker_browser = None
+
+
+def _init_worker(debugger_ports, abp_filter_filenames, record_all_response_headers=True, record_tracebacks=True,
+                 highlight_cookie_notices=True):
+    """Connects the worker process to a browser that is not used by any other worker."""
+    global _worker_browser
+    debugger_port = debugger_ports.get()
+    _worker_browser = Browser(abp_filter_filenames=abp_filter_filenames, debugger_url=f'http://127.0.0.1:{debugger_port}',
+                              record_all_response_headers=record_all_response_headers,
+                              record_tracebacks=record_tracebacks,
+                              highlight_cookie_notices=highlight_cookie_notices)
+
+
+def scan_worker(webpage, do_click=False):
+    """Scans the webpage with the browser of the current worker process."""
+    return _worker_browser.scan_page(webpage, do_click)
+
 
 if __name__ == '__main__':
     ARG_TOP_2000 = '1'
@@ -1605,33 +1965,61 @@ if __name__ == '__main__':
                         help='whether links and buttons in the detected cookie notices should be ' +
                              'clicked and analyzed or not ' +
                              '(default: false)')
+    parser.add_argument('--browsers', dest='browsers', nargs='?', type=int, default=1,
+                        help='the number of browsers to scan with in parallel, the browsers have to ' +
+                             f'listen on the debugging ports {DEBUGGER_BASE_PORT}, {DEBUGGER_BASE_PORT + 1}, ... ' +
+                             '(default: 1)')
+    parser.add_argument('--root-headers-only', dest='root_headers_only', action="store_true",
+                        help='whether only the response headers of the page itself should be stored ' +
+                             'and not the ones of the other loaded resources ' +
+                             '(default: false)')
+    parser.add_argument('--no-tracebacks', dest='no_tracebacks', action="store_true",
+                        help='whether the tracebacks of exceptions should be omitted from the warnings ' +
+                             '(default: false)')
+    parser.add_argument('--no-highlight', dest='no_highlight', action="store_true",
+                        help='whether only the screenshot of the page should be taken and not the ' +
+                             'screenshots with each detected cookie notice highlighted ' +
+                             '(default: false)')
 
     # load the correct dataset
+    # (the domains are only read when they are scanned)
     args = parser.parse_args()
-    if args.dataset == ARG_TOP_2000:
-        tranco = Tranco(cache=True, cache_dir='tranco')
-        tranco_list = tranco.list(date='2020-03-01')
-        domains = tranco_list.top(2000)
-    else:
-        domains = []
-        with open('resources/sampled-domains.txt') as f:
-            domains = [line.strip() for line in f]
+    def iter_domains():
+        if args.dataset == ARG_TOP_2000:
+            tranco = Tranco(cache=True, cache_dir='tranco')
+            tranco_list = tranco.list(date='2020-03-01')
+            yield from tranco_list.top(2000)
+        else:
+            with open('resources/sampled-domains.txt') as f:
+                for line in f:
+                    yield line.strip()
 
     # create multiprocessor pool:
-    # currently only one tab is processed at a time -> not parallel
-    pool = mp.Pool(1)
-
-    # create the browser and a helper function to scan pages
-    browser = Browser(abp_filter_filenames=['resources/easylist-cookie.txt', 'resources/i-dont-care-about-cookies.txt'])
-    f_scan_page = partial(Browser.scan_page, browser)
+    # every worker process controls its own browser (one tab at a time), 
+    # each browser is listening on its own debugging port
+    debugger_ports = mp.Queue()
+    for i in range(args.browsers):
+        debugger_ports.put(DEBUGGER_BASE_PORT + i)
+    abp_filter_filenames = ['resources/easylist-cookie.txt', 'resources/i-dont-care-about-cookies.txt']
+    _load_abp_filters(tuple(abp_filter_filenames))
+    pool = mp.Pool(args.browsers, initializer=_init_worker, initargs=(debugger_ports, abp_filter_filenames, not args.root_headers_only, not args.no_tracebacks, not args.no_highlight))
 
     # create results directory if necessary
     os.makedirs(args.results_directory, exist_ok=True)
 
+    # only a few pages per browser are queued, so the pages of the whole
+    # dataset are not created at once
+    queued_pages = threading.BoundedSemaphore(2 * args.browsers)
+
     # this is a callback function that is called when scanning a page finished
     def f_page_scanned(result):
-        # cookies are not correct if pages are scanned in parallel
-        #result.exclude_field_from_json('cookies')
+        queued_pages.release()
+
+        # the cookies are correct even if pages are scanned in parallel:
+        # every browser has its own profile and scans one page at a time
+        # (cookies would only be mixed up if pages were scanned in parallel
+        # tabs of the same browser, then they should be excluded with
+        # `result.exclude_field_from_json('cookies')`)
 
         # save results and screenshots
         result.save_data(args.results_directory)
@@ -1648,13 +2036,21 @@ if __name__ == '__main__':
             if result.failed_traceback is not None:
                 print(result.failed_traceback)
 
+    # this is a callback function that is called when scanning a page raised an exception
+    def f_page_failed(e):
+        queued_pages.release()
+        print(f'-> scanning failed: {type(e).__name__} ({e})')
+
     # scan the pages
-    for rank, domain in enumerate(domains, start=1):
+    for rank, domain in enumerate(iter_domains(), start=1):
         # skip everything that is not between start and end rank
-        if rank < args.start_rank or (args.end_rank != -1 and rank > args.end_rank):
+        if rank < args.start_rank:
             continue
+        if args.end_rank != -1 and rank > args.end_rank:
+            break
         webpage = Webpage(rank=rank, domain=domain)
-        pool.apply_async(f_scan_page, args=(webpage, args.do_click), callback=f_page_scanned)
+        queued_pages.acquire()
+        pool.apply_async(scan_worker, args=(webpage, args.do_click), callback=f_page_scanned, error_callback=f_page_failed)
 
     # close pool
     pool.close()